@@ -1,13 +1,21 @@
 from dotenv import load_dotenv
+import asyncio
 import os
+import random
 from pathlib import Path
 import utils
 
-def main():
+async def main_async():
     # Load environment variables from .env file
     load_dotenv()
     OUTPUT_DURATION = int(os.getenv("OUTPUT_DURATION", 8))
 
+    # Optional deterministic mode: seed the RNG so clip selection and
+    # ordering are reproducible across runs.
+    RANDOM_SEED = os.getenv("RANDOM_SEED")
+    if RANDOM_SEED is not None:
+        random.seed(int(RANDOM_SEED))
+
     PROJECT_DIR = Path.cwd()
 
     INPUT_DIR = Path(os.getenv("INPUT_DIR", "./input/"))
@@ -26,8 +34,11 @@ def main():
     ASPECT_RATIO = os.getenv("ASPECT_RATIO", "9-16")
     
     # Perform video processing
-    utils.process_video_urls(INPUT_DIR, DOWNLOAD_URLS, VIDEO_URLS, TEMP_DIR, PROJECT_DIR, ASPECT_RATIOS)
-    utils.clip_and_concat_videos(INPUT_DIR, ASPECT_RATIO, OUTPUT_DURATION, TEMP_DIR, OUTPUT_DIR)
+    await utils.process_video_urls(INPUT_DIR, DOWNLOAD_URLS, VIDEO_URLS, TEMP_DIR, PROJECT_DIR, ASPECT_RATIOS)
+    await utils.clip_and_concat_videos(INPUT_DIR, ASPECT_RATIO, OUTPUT_DURATION, TEMP_DIR, OUTPUT_DIR)
+
+def main():
+    asyncio.run(main_async())
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,34 @@
+import asyncio
+import atexit
+import json
+import math
+import os
 import subprocess
 import random
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+async def run_command(command, semaphore, pass_fds=()):
+    """
+    Runs a command as an asyncio subprocess under a concurrency bound.
+
+    Args:
+        command (list): Argument vector to execute.
+        semaphore (asyncio.Semaphore): Bound on concurrent processes.
+        pass_fds (tuple): File descriptors to leave open in the child.
+
+    Raises:
+        subprocess.CalledProcessError: If the command exits non-zero.
+    """
+    async with semaphore:
+        process = await asyncio.create_subprocess_exec(
+            *[str(arg) for arg in command],
+            stdout=asyncio.subprocess.DEVNULL,
+            pass_fds=pass_fds)
+        await process.wait()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
 
 ################################################################################
 # Process URLs file, download and adjust aspect ratio
@@ -19,10 +47,13 @@ def get_urls(input_file_path):
         lines = file.readlines()        
     return [line.strip() for line in lines if line.startswith("https://")]
 
-def process_video_urls(INPUT_DIR, DOWNLOAD_URLS, VIDEO_URLS, TEMP_DIR, PROJECT_DIR, ASPECT_RATIOS):
+async def process_video_urls(INPUT_DIR, DOWNLOAD_URLS, VIDEO_URLS, TEMP_DIR, PROJECT_DIR, ASPECT_RATIOS):
     """
     Downloads videos from URLs and processes them to different aspect ratios.
 
+    Downloads and transcodes each run as asyncio subprocesses under their
+    own concurrency bounds.
+
     Args:
         INPUT_DIR (Path): Path to the input directory.
         DOWNLOAD_URLS (bool): Flag to determine if URLs should be downloaded.
@@ -31,15 +62,21 @@ def process_video_urls(INPUT_DIR, DOWNLOAD_URLS, VIDEO_URLS, TEMP_DIR, PROJECT_D
         PROJECT_DIR (Path): Path to the project directory.
         ASPECT_RATIOS (list): List of aspect ratios to process the videos into.
     """
-    video_files = list(INPUT_DIR.glob("*/*.mp4"))
+    video_files = scan_input_dir(INPUT_DIR)
     if len(video_files) == 0 or DOWNLOAD_URLS:
         urls = get_urls(VIDEO_URLS)
-        for url in urls:
+        download_semaphore = asyncio.Semaphore(int(os.getenv("DOWNLOAD_CONCURRENCY", 4)))
+
+        async def download(url):
             try:
-                subprocess.run(['yt-dlp', '-P', TEMP_DIR, url], check=True)
+                await run_command(['yt-dlp', '-P', str(TEMP_DIR), '--no-part',
+                                   '--concurrent-fragments', '4', url], download_semaphore)
             except subprocess.CalledProcessError:
                 print(f"Unable to download: {url}")
+
+        await asyncio.gather(*[download(url) for url in urls])
         
+        transcode_tasks = []
         for video in list(TEMP_DIR.glob("*")):
             temp_video_path = PROJECT_DIR / video
             unique_id = get_file_unique_id(temp_video_path)
@@ -48,79 +85,396 @@ def process_video_urls(INPUT_DIR, DOWNLOAD_URLS, VIDEO_URLS, TEMP_DIR, PROJECT_D
                 aspect_ratio_dir.mkdir(exist_ok=True)
                 final_input_file_path = INPUT_DIR / f"{aspect_ratio}" / f"{unique_id}.mp4"
                 if not final_input_file_path.exists():
-                    ffmpeg_command = get_ffmpeg_command(temp_video_path, final_input_file_path, aspect_ratio)
-                    subprocess.run(ffmpeg_command, check=True)
+                    transcode_tasks.append((temp_video_path, final_input_file_path, aspect_ratio))
+
+        # Each ffmpeg runs with -threads 2, so pool_size * 2 ~= cpu_count.
+        pool_size = max(1, (os.cpu_count() or 2) // 2)
+        transcode_semaphore = asyncio.Semaphore(pool_size)
+        await asyncio.gather(*[
+            run_command(get_ffmpeg_command(temp_video_path, final_input_file_path, aspect_ratio),
+                        transcode_semaphore)
+            for temp_video_path, final_input_file_path, aspect_ratio in transcode_tasks
+        ])
         
-        for file in TEMP_DIR.iterdir():
-            if file.is_file():
-                file.unlink()
+        clear_temp_files(TEMP_DIR)
+
+_hw_encoder = None
+
+def _probe_encoder(encoder):
+    """
+    Checks that an encoder actually works with a one-frame test encode.
+
+    ffmpeg lists compile-time encoder support, so h264_nvenc/h264_qsv
+    show up even on machines without the GPU or driver to back them.
+
+    Args:
+        encoder (str): Name of the ffmpeg encoder to test.
+
+    Returns:
+        bool: True if the test encode succeeded.
+    """
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-f", "lavfi", "-i", "color=black:s=64x64",
+             "-frames:v", "1", "-c:v", encoder, "-f", "null", "-"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        return result.returncode == 0
+    except OSError:
+        return False
+
+def detect_hw_encoder():
+    """
+    Picks the best available H.264 encoder, preferring hardware encoders.
+
+    Each candidate listed by `ffmpeg -encoders` is validated with a
+    one-frame probe encode before being chosen; the answer is cached for
+    the rest of the run, falling back to libx264 when no hardware
+    encoder works.
+
+    Returns:
+        str: Name of the ffmpeg encoder to use.
+    """
+    global _hw_encoder
+    if _hw_encoder is None:
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-encoders"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                check=True,
+                text=True
+            )
+            available = result.stdout
+        except (OSError, subprocess.CalledProcessError):
+            available = ""
+
+        _hw_encoder = "libx264"
+        for encoder in ("h264_nvenc", "h264_qsv", "h264_videotoolbox"):
+            if encoder in available and _probe_encoder(encoder):
+                _hw_encoder = encoder
+                break
+    return _hw_encoder
+
+def get_encoder_args(encoder, preset="fast"):
+    """
+    Returns quality arguments roughly equivalent to libx264 crf 23 for
+    the given encoder. The preset only applies to libx264.
+
+    Args:
+        encoder (str): Name of the ffmpeg encoder.
+        preset (str): libx264 preset to use for the software fallback.
+
+    Returns:
+        list: ffmpeg arguments selecting the encoder and its quality.
+    """
+    if encoder == "h264_nvenc":
+        return ["-c:v", encoder, "-preset", "p5", "-rc", "vbr", "-cq", "23"]
+    elif encoder == "h264_qsv":
+        return ["-c:v", encoder, "-global_quality", "23"]
+    elif encoder == "h264_videotoolbox":
+        return ["-c:v", encoder, "-q:v", "55"]
+    return ["-c:v", "libx264", "-preset", preset, "-crf", "23"]
+
+_input_index = {}
+
+def scan_input_dir(INPUT_DIR, subdir=None):
+    """
+    Lists the .mp4 files in the input directory's aspect-ratio folders.
+
+    Results are cached in memory per folder and invalidated when the
+    folder's mtime changes, so repeated scans avoid re-walking the tree.
+    os.scandir is used instead of glob, skipping fnmatch and per-entry
+    Path construction on the rebuild path.
+
+    Args:
+        INPUT_DIR (Path): Path to the input directory.
+        subdir (str): Optional single aspect-ratio folder to scan.
+
+    Returns:
+        list: Paths of the .mp4 files found.
+    """
+    root = Path(INPUT_DIR)
+    if subdir is not None:
+        folders = [root / subdir]
+    else:
+        folders = [Path(entry.path) for entry in os.scandir(root) if entry.is_dir()]
+
+    files = []
+    for folder in folders:
+        try:
+            mtime = folder.stat().st_mtime_ns
+        except OSError:
+            continue
+
+        cached = _input_index.get(str(folder))
+        if cached is not None and cached[0] == mtime:
+            files.extend(cached[1])
+            continue
+
+        entries = []
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.endswith(".mp4") and entry.is_file():
+                    entries.append(Path(entry.path))
+        _input_index[str(folder)] = (mtime, entries)
+        files.extend(entries)
+
+    return files
+
+def clear_temp_files(TEMP_DIR):
+    """
+    Deletes all regular files in the temporary directory.
+
+    Uses os.scandir so file types come straight from the directory read
+    instead of a stat call per entry; dotfiles (cache sidecars) are kept.
+
+    Args:
+        TEMP_DIR (Path): Path to the temporary directory.
+    """
+    with os.scandir(TEMP_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and not entry.name.startswith("."):
+                os.unlink(entry.path)
 
 ################################################################################
 # Clip and Concat Helpers
 ################################################################################
+_probe_cache = None
+
+def _load_probe_cache():
+    """
+    Loads the ffprobe duration cache from its JSON sidecar, once per run.
+
+    Returns:
+        dict: Mapping of "path:mtime_ns:size" keys to durations in seconds.
+    """
+    global _probe_cache
+    if _probe_cache is None:
+        try:
+            with open(_probe_cache_path()) as f:
+                _probe_cache = json.load(f)
+        except (OSError, ValueError):
+            _probe_cache = {}
+        atexit.register(_save_probe_cache)
+    return _probe_cache
+
+def _probe_cache_path():
+    return Path(os.getenv("TEMP_DIR", "./temp/")) / ".probe_cache.json"
+
+def _save_probe_cache():
+    try:
+        cache_path = _probe_cache_path()
+        cache_path.parent.mkdir(exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(_probe_cache, f)
+    except OSError:
+        pass
+
 def get_video_duration(filepath):
     """
     Retrieves the duration of a video file in seconds.
 
+    Results are cached in a JSON sidecar keyed by path, mtime and size, so
+    a file is only probed once until it changes on disk.
+
     Args:
         filepath (Path): Path to the video file.
 
     Returns:
         float: Duration of the video in seconds.
     """
+    cache = _load_probe_cache()
+    stat = os.stat(filepath)
+    cache_key = f"{filepath}:{stat.st_mtime_ns}:{stat.st_size}"
+    if cache_key in cache:
+        return cache[cache_key]
+
+    # Read only the container header; most formats report duration there
+    # without a stream scan.
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-probesize", "32K", "-analyzeduration", "0",
+         "-read_intervals", "%+#1", "-show_entries", "format=duration",
+         "-of", "csv=p=0", str(filepath)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        check=True,
+        text=True
+    )
+    output = result.stdout.strip()
+
+    if not output or output == "N/A":
+        # Rare containers (e.g. mpeg-ts) omit the duration from the header;
+        # fall back to an unconstrained probe for those.
+        result = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+             "-of", "csv=p=0", str(filepath)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            check=True,
+            text=True
+        )
+        output = result.stdout.strip()
+
+    duration = float(output)
+    cache[cache_key] = duration
+    return duration
+
+def get_video_stream_params(filepath):
+    """
+    Retrieves the video codec parameters of a file.
+
+    Args:
+        filepath (Path): Path to the video file.
+
+    Returns:
+        str: Comma-separated codec name, width, height and pixel format.
+    """
     result = subprocess.run(
-        ["ffprobe", "-v", "error", "-show_entries", "format=duration", 
-         "-of", "default=noprint_wrappers=1:nokey=1", str(filepath)],
+        ["ffprobe", "-v", "error", "-select_streams", "v:0",
+         "-show_entries", "stream=codec_name,width,height,pix_fmt",
+         "-of", "csv=p=0", str(filepath)],
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         check=True,
         text=True
     )
-    return float(result.stdout.strip())
+    return result.stdout.strip()
 
-def extract_random_clip(filepath, duration, clip_path):
+async def extract_clips_batch(filepath, windows, out_pattern, semaphore):
     """
-    Extracts a random clip from a video file.
+    Extracts several clips from a video file with a single ffmpeg call.
+
+    The clip windows are selected with one `select=between(t,...)` filter so
+    the input is opened and decoded only once, then split back into separate
+    files by the segment muxer. The ffmpeg process runs asynchronously so
+    extractions for different source files can overlap.
 
     Args:
         filepath (Path): Path to the original video file.
-        duration (float): Duration of the original video in seconds.
-        clip_path (Path): Path where the extracted clip will be saved.
+        windows (list): List of (start_time, clip_duration) tuples.
+        out_pattern (str): printf-style output path, e.g. "clip_%03d.mp4".
+        semaphore (asyncio.Semaphore): Bound on concurrent ffmpeg processes.
 
     Returns:
-        float: Duration of the extracted clip.
+        list: Paths of the extracted clips, one per window in the given order.
     """
-    start_time = random.uniform(0, duration - 2)
-    clip_duration = random.uniform(1, 2)
+    order = sorted(range(len(windows)), key=lambda i: windows[i][0])
 
-    subprocess.run([
-        "ffmpeg", "-y", "-ss", str(start_time), "-i", str(filepath),
-        "-t", str(clip_duration), "-an", "-vf", "fps=30",
-        "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-        "-pix_fmt", "yuv420p", str(clip_path)
-    ], check=True)
+    command = ["ffmpeg", "-y", "-hwaccel", "auto"]
+    if len(windows) == 1:
+        # Single window: input-side -ss seeks by keyframe instead of
+        # decoding the whole file through the select filter.
+        start_time, clip_duration = windows[0]
+        command += [
+            "-ss", str(start_time), "-i", str(filepath),
+            "-t", str(clip_duration)
+        ]
+    else:
+        select_expr = "+".join(
+            f"between(t,{windows[i][0]},{windows[i][0] + windows[i][1]})" for i in order
+        )
+        command += [
+            "-i", str(filepath),
+            "-vf", f"select='{select_expr}',setpts=N/FRAME_RATE/TB"
+        ]
+
+    command += [
+        "-an", "-r", "30",
+        *get_encoder_args(detect_hw_encoder(), preset="ultrafast"),
+        "-pix_fmt", "yuv420p", "-video_track_timescale", "15360",
+        "-avoid_negative_ts", "make_zero",
+        "-fflags", "+genpts", "-muxpreload", "0", "-muxdelay", "0"
+    ]
 
-    return clip_duration
+    if len(windows) > 1:
+        # Split on the cumulative clip durations since setpts compacted the
+        # timeline; force a keyframe at each boundary so the cuts are clean.
+        boundaries = []
+        elapsed = 0
+        for i in order[:-1]:
+            elapsed += windows[i][1]
+            boundaries.append(str(elapsed))
+        command += [
+            "-force_key_frames", ",".join(boundaries),
+            "-f", "segment", "-segment_times", ",".join(boundaries),
+            "-segment_format_options", "movflags=+faststart+empty_moov",
+            "-reset_timestamps", "1", str(out_pattern)
+        ]
+    else:
+        command += ["-movflags", "+faststart+empty_moov", str(out_pattern) % 0]
+
+    await run_command(command, semaphore)
+
+    clip_paths = [None] * len(windows)
+    for segment_number, i in enumerate(order):
+        clip_paths[i] = Path(str(out_pattern) % segment_number)
+    return clip_paths
 
 def get_file_unique_id(file_path):
     """
-    Generates a unique identifier for a file based on its SHA-256 hash.
+    Generates a unique identifier for a file based on a SHA-256 hash of its
+    size plus its first and last 64 KiB.
+
+    The ID is only used to dedupe already-converted downloads, so sampling
+    the head and tail gives plenty of entropy while keeping the read cost
+    constant instead of proportional to the file size.
 
     Args:
         file_path (Path): Path to the file.
 
     Returns:
-        str: A unique identifier based on the last 10 characters of the hash.
+        str: A 10-character identifier derived from the hash.
     """
+    sample_size = 65536
+    size = os.stat(file_path).st_size
+
+    file_hash = hashlib.sha256()
+    file_hash.update(size.to_bytes(8, "little"))
     with open(file_path, "rb") as f:
-        file_hash = hashlib.sha256()
-        
-        while chunk := f.read(8192):
-            file_hash.update(chunk)
-    
-    hash_hex = file_hash.hexdigest()
-    
-    return hash_hex[-10:]
+        file_hash.update(f.read(sample_size))
+        if size > 2 * sample_size:
+            f.seek(-sample_size, os.SEEK_END)
+            file_hash.update(f.read(sample_size))
+
+    return file_hash.hexdigest()[:10]
+
+_cmd_templates = None
+
+def _get_cmd_templates():
+    """
+    Builds one frozen argv template per aspect ratio, once per run.
+
+    The boxblur radius is precomputed (min(W,H)/20 = 54 for both ratios)
+    so ffmpeg no longer re-evaluates the expression, and only the
+    {input}/{output} placeholders vary between calls.
+
+    Returns:
+        dict: Mapping of aspect ratio to its argv tuple.
+    """
+    global _cmd_templates
+    if _cmd_templates is None:
+        encoder_args = get_encoder_args(detect_hw_encoder())
+        _cmd_templates = {
+            "9-16": (
+                'ffmpeg', '-hwaccel', 'auto', '-i', '{input}', '-vf',
+                "split[original][copy];"
+                "[copy]scale=1080:1920,boxblur=luma_radius=54:luma_power=1[blurred];"
+                "[original]scale='if(gt(a,9/16),1080,-2)':'if(gt(a,9/16),-2,1920)'[scaled];"
+                "[blurred][scaled]overlay=(W-w)/2:(H-h)/2,setsar=1",
+                *encoder_args, '-threads', '2', '-c:a', 'copy', '{output}'
+            ),
+            "1-1": (
+                'ffmpeg', '-hwaccel', 'auto', '-i', '{input}', '-vf',
+                "split[original][copy];"
+                "[copy]scale=1080:1080,boxblur=luma_radius=54:luma_power=1[blurred];"
+                "[original]scale='if(gt(a,1),1080,-2)':'if(gt(a,1),-2,1080)'[scaled];"
+                "[blurred][scaled]overlay=(W-w)/2:(H-h)/2,setsar=1",
+                *encoder_args, '-threads', '2', '-c:a', 'copy', '{output}'
+            ),
+        }
+    return _cmd_templates
 
 def get_ffmpeg_command(input_file, output_file, aspect_ratio):
     """
@@ -134,29 +488,21 @@ def get_ffmpeg_command(input_file, output_file, aspect_ratio):
     Returns:
         list: A list containing the FFmpeg command.
     """
-    if aspect_ratio == "9-16":
-        return [
-            'ffmpeg', '-i', input_file, '-vf',
-            "split[original][copy];"
-            "[copy]scale=1080:1920,boxblur=luma_radius=min(1080\\,1920)/20:luma_power=1[blurred];"
-            "[original]scale='if(gt(a,9/16),1080,-2)':'if(gt(a,9/16),-2,1920)'[scaled];"
-            "[blurred][scaled]overlay=(W-w)/2:(H-h)/2,setsar=1",
-            '-c:a', 'copy', output_file
-        ]
-    elif aspect_ratio == "1-1":
-        return [
-            'ffmpeg', '-i', input_file, '-vf',
-            "split[original][copy];"
-            "[copy]scale=1080:1080,boxblur=luma_radius=min(1080\\,1080)/20:luma_power=1[blurred];"
-            "[original]scale='if(gt(a,1),1080,-2)':'if(gt(a,1),-2,1080)'[scaled];"
-            "[blurred][scaled]overlay=(W-w)/2:(H-h)/2,setsar=1",
-            '-c:a', 'copy', output_file
-        ]
+    template = _get_cmd_templates().get(aspect_ratio)
+    if template is None:
+        return None
+    return [
+        input_file if arg == '{input}' else output_file if arg == '{output}' else arg
+        for arg in template
+    ]
 
-def clip_and_concat_videos(INPUT_DIR, ASPECT_RATIO, OUTPUT_DURATION, TEMP_DIR, OUTPUT_DIR):
+async def clip_and_concat_videos(INPUT_DIR, ASPECT_RATIO, OUTPUT_DURATION, TEMP_DIR, OUTPUT_DIR):
     """
     Clips random segments from videos and concatenates them into a single video.
 
+    All ffmpeg invocations run as asyncio subprocesses under one
+    CPU-count-bounded semaphore.
+
     Args:
         INPUT_DIR (Path): Path to the directory containing input videos.
         ASPECT_RATIO (str): Aspect ratio of the videos to process.
@@ -164,43 +510,100 @@ def clip_and_concat_videos(INPUT_DIR, ASPECT_RATIO, OUTPUT_DURATION, TEMP_DIR, O
         TEMP_DIR (Path): Path to the temporary directory for clips.
         OUTPUT_DIR (Path): Path to the directory where the final video will be saved.
     """
-    video_files = list(INPUT_DIR.glob(f"{ASPECT_RATIO}/*.mp4"))
-    selected_files = set()
-    clip_paths = []
-
-    total_duration = 0
-    while total_duration <= OUTPUT_DURATION:
-        file = random.choice(video_files)
-        if file in selected_files:
-            continue
+    video_files = scan_input_dir(INPUT_DIR, ASPECT_RATIO)
 
-        selected_files.add(file)
-        clip_path = TEMP_DIR / f"clip_{len(selected_files)}.mp4"
+    # Sample all candidates up front: clips average 1.5s, so this many
+    # distinct files is enough to cover the target duration without the
+    # old pick-and-reject loop, which spun forever once every file had
+    # been chosen.
+    expected_clips = math.ceil(OUTPUT_DURATION / 1.5) + 2
+    candidates = random.sample(video_files, min(expected_clips, len(video_files)))
 
+    # Probe every candidate once with overlapping ffprobe spawns, so the
+    # selection loop below runs against in-memory durations only.
+    def probe(file):
         try:
-            duration = get_video_duration(file)
-            if duration >= 2:
-                clip_duration = extract_random_clip(file, duration, clip_path)
-                print(clip_duration)
-                clip_paths.append(clip_path)
-                total_duration += clip_duration
+            return get_video_duration(file)
         except Exception:
+            return None
+
+    durations = {}
+    if candidates:
+        with ThreadPoolExecutor(max_workers=min(len(candidates), os.cpu_count() or 2)) as executor:
+            durations = dict(zip(candidates, executor.map(probe, candidates)))
+
+    windows_by_file = {}
+    sample_order = []
+
+    total_duration = 0
+    for file in candidates:
+        if total_duration > OUTPUT_DURATION:
+            break
+
+        duration = durations[file]
+        if duration is not None and duration >= 2:
+            start_time = random.uniform(0, duration - 2)
+            clip_duration = random.uniform(1, 2)
+            windows_by_file.setdefault(file, []).append((start_time, clip_duration))
+            sample_order.append((file, len(windows_by_file[file]) - 1))
+            print(clip_duration)
+            total_duration += clip_duration
+
+    semaphore = asyncio.Semaphore(os.cpu_count() or 2)
+    extractions = await asyncio.gather(*[
+        extract_clips_batch(file, windows, str(TEMP_DIR / f"clip_{file_number}_%03d.mp4"), semaphore)
+        for file_number, (file, windows) in enumerate(windows_by_file.items())
+    ], return_exceptions=True)
+
+    # One bad source should degrade the output, not kill the run: drop the
+    # files whose extraction failed and concatenate the clips that succeeded.
+    clips_by_file = {}
+    for file, clips in zip(windows_by_file, extractions):
+        if isinstance(clips, Exception):
+            print(f"Unable to extract clips from: {file}")
             continue
+        clips_by_file[file] = clips
 
+    clip_paths = [clips_by_file[file][i] for file, i in sample_order if file in clips_by_file]
     random.shuffle(clip_paths)
-    concat_list_path = TEMP_DIR / "concat_list.txt"
+    concat_list = "".join(f"file '{clip.resolve()}'\n" for clip in clip_paths).encode()
 
-    with open(concat_list_path, "w") as f:
-        for clip in clip_paths:
-            f.write(f"file '{clip.resolve()}'\n")
+    # The concat list exists only to hand the clip order to ffmpeg, so on
+    # Linux keep it in an anonymous memfd and pass it via /proc/self/fd
+    # instead of round-tripping through the filesystem.
+    if hasattr(os, "memfd_create"):
+        list_fd = os.memfd_create("concat_list")
+        os.write(list_fd, concat_list)
+        os.lseek(list_fd, 0, os.SEEK_SET)
+        concat_input = f"/proc/self/fd/{list_fd}"
+        pass_fds = [list_fd]
+    else:
+        concat_list_path = TEMP_DIR / "concat_list.txt"
+        concat_list_path.write_bytes(concat_list)
+        concat_input = str(concat_list_path)
+        pass_fds = []
 
     output_file = OUTPUT_DIR / "output.mp4"
-    subprocess.run([
-        "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", str(concat_list_path),
-        "-c:v", "libx264", "-preset", "fast", "-crf", "23",
-        "-pix_fmt", "yuv420p", "-an", output_file
-    ], check=True)
-
-    for file in TEMP_DIR.iterdir():
-        if file.is_file():
-            file.unlink()
+
+    # Every clip was just encoded with identical parameters and a shared
+    # timebase, so the concat demuxer can remux with -c copy instead of
+    # paying for a second encode. Re-encode only if the clips disagree.
+    if len({get_video_stream_params(clip) for clip in clip_paths}) == 1:
+        print("Concatenating with stream copy")
+        codec_args = ["-c", "copy"]
+    else:
+        print("Clip parameters differ, concatenating with re-encode")
+        codec_args = [*get_encoder_args(detect_hw_encoder()),
+                      "-pix_fmt", "yuv420p", "-an"]
+
+    try:
+        await run_command([
+            "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", concat_input,
+            *codec_args, "-muxpreload", "0", "-muxdelay", "0",
+            "-movflags", "+faststart", output_file
+        ], semaphore, pass_fds=pass_fds)
+    finally:
+        for fd in pass_fds:
+            os.close(fd)
+
+    clear_temp_files(TEMP_DIR)